@@ -8,15 +8,33 @@ Usage:
     python scripts/build_summary.py --market us
     python scripts/build_summary.py --market kr
     python scripts/build_summary.py              # both
+    python scripts/build_summary.py --force      # ignore unchanged-input cache
+
+섹션별 입력 파일(mtime/size)을 out/{market}/.summary_manifest.json 에 기록하고,
+입력이 바뀌지 않은 섹션은 이전 summary.json 값을 그대로 재사용한다.
+이 스크립트나 config_defaults.py 가 바뀌면 (MANIFEST_VERSION) 모든 섹션을 다시 만든다.
 """
 import argparse
+import hashlib
 import json
 import os
 import sys
+from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import pandas as pd
 
+import config_defaults
+from config_defaults import CYCLE_WINDOWS
+from utils_date import to_datetime_col
+from utils_io import invalidate_csv_cache, read_csv_cached
+
+try:
+    import orjson  # optional: C-accelerated JSON writer
+except ImportError:
+    orjson = None
+
 BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # ---------------------------------------------------------------------------
@@ -24,12 +42,16 @@ BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # ---------------------------------------------------------------------------
 
 def _read(market, folder, fname):
-    """Read CSV from data/ or out/ with silent failure."""
+    """Read CSV from data/ or out/ with silent failure.
+
+    Goes through the <fname>.parquet sidecar cache, so unchanged inputs are
+    not re-parsed on every summary build.
+    """
     path = os.path.join(BASE, folder, market, fname)
     if not os.path.exists(path):
         return None
     try:
-        return pd.read_csv(path, encoding='utf-8-sig')
+        return read_csv_cached(path)
     except Exception:
         return None
 
@@ -42,6 +64,26 @@ def _read_json(market, folder, fname):
         return json.load(f)
 
 
+def _write_json(path, obj):
+    """Write pretty-printed UTF-8 JSON, via orjson when it is installed.
+
+    Output is semantically (not byte-) identical to json.dump: orjson spells
+    some floats differently (5e-6 vs 5e-06). Anything orjson rejects, such
+    as non-str dict keys, goes through json.dump, which coerces them.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:  # orjson.JSONEncodeError
+            pass
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
 def _safe_val(v):
     """Convert numpy/pandas types to JSON-serializable Python types."""
     if pd.isna(v):
@@ -50,6 +92,11 @@ def _safe_val(v):
         return v.item()
     return v
 
+
+def _to_records(df):
+    """DataFrame → list of dicts with native Python scalars and None for NaN."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
 # ---------------------------------------------------------------------------
 # Section builders
 # ---------------------------------------------------------------------------
@@ -67,46 +114,30 @@ def build_meta(market):
     return {}
 
 
+# macro_impact.csv column → summary.json key, in output order
+_IMPACT_FIELDS = {
+    'event_type': 'event', 'sector': 'sector', 'metric': 'metric',
+    'beta': 'beta', 't_stat': 't_stat', 'p_adj_bh': 'p_adj',
+}
+
+
 def build_significant_impacts(market, top_n=15):
     """Top N significant macro-sector impacts by |t_stat|."""
     df = _read(market, 'out', 'macro_impact.csv')
     if df is None or df.empty:
         return []
     # Filter significant only
-    sig = df[df['significant_bh'] == True].copy()
-    if sig.empty:
+    sig = df[df['significant_bh'] == True]
+    significant = not sig.empty
+    if not significant:
         # Fallback: top by |t_stat| even if not significant
-        sig = df.dropna(subset=['t_stat']).copy()
-        sig['_abs_t'] = sig['t_stat'].abs()
-        sig = sig.nlargest(top_n, '_abs_t')
-        return [
-            {
-                'event': row['event_type'],
-                'sector': row['sector'],
-                'metric': row['metric'],
-                'beta': _safe_val(round(row['beta'], 5)) if pd.notna(row.get('beta')) else None,
-                't_stat': _safe_val(round(row['t_stat'], 3)),
-                'p_adj': _safe_val(round(row['p_adj_bh'], 4)) if pd.notna(row.get('p_adj_bh')) else None,
-                'significant': False,
-                'n': _safe_val(row['n']),
-            }
-            for _, row in sig.iterrows()
-        ]
-    sig['_abs_t'] = sig['t_stat'].abs()
-    sig = sig.nlargest(top_n, '_abs_t')
-    return [
-        {
-            'event': row['event_type'],
-            'sector': row['sector'],
-            'metric': row['metric'],
-            'beta': _safe_val(round(row['beta'], 5)),
-            't_stat': _safe_val(round(row['t_stat'], 3)),
-            'p_adj': _safe_val(round(row['p_adj_bh'], 4)) if pd.notna(row.get('p_adj_bh')) else None,
-            'significant': True,
-            'n': _safe_val(row['n']),
-        }
-        for _, row in sig.iterrows()
-    ]
+        sig = df.dropna(subset=['t_stat'])
+
+    # beta / p_adj_bh are optional in macro_impact.csv: missing columns → None
+    top = sig.loc[sig['t_stat'].abs().nlargest(top_n).index].reindex(columns=[*_IMPACT_FIELDS, 'n'])
+    top = top.round({'beta': 5, 't_stat': 3, 'p_adj_bh': 4}).rename(columns=_IMPACT_FIELDS)
+    top.insert(len(_IMPACT_FIELDS), 'significant', significant)
+    return _to_records(top)
 
 
 def build_regime_sectors(market, top_n=5):
@@ -117,8 +148,8 @@ def build_regime_sectors(market, top_n=5):
         return {}
 
     # Find current regime (last row by end_date)
-    regimes['end_date'] = pd.to_datetime(regimes['end_date'])
-    current = regimes.sort_values('end_date').iloc[-1]
+    regimes['end_date'] = to_datetime_col(regimes['end_date'])
+    current = regimes.dropna(subset=['end_date']).sort_values('end_date').iloc[-1]
     regime_name = current['regime']
     start = str(current.get('start_date', ''))
     end = str(current['end_date'].date())
@@ -132,7 +163,7 @@ def build_regime_sectors(market, top_n=5):
 
     if sub.empty:
         # Fallback: latest regime block
-        regime_avg['end_date_dt'] = pd.to_datetime(regime_avg['end_date'])
+        regime_avg['end_date_dt'] = to_datetime_col(regime_avg['end_date'])
         latest_end = regime_avg['end_date_dt'].max()
         sub = regime_avg[regime_avg['end_date_dt'] == latest_end].copy()
 
@@ -140,20 +171,15 @@ def build_regime_sectors(market, top_n=5):
         return {'regime': regime_name, 'period': f'{start} ~ {end}'}
 
     sub = sub.sort_values('avg_daily_return', ascending=False)
+    sub = sub[['sector', 'avg_daily_return']].round({'avg_daily_return': 6})
     top = sub.head(top_n)
     bottom = sub.tail(top_n).sort_values('avg_daily_return')
 
     return {
         'regime': regime_name,
         'period': f'{start} ~ {end}',
-        'top_sectors': [
-            {'sector': r['sector'], 'avg_daily_return': _safe_val(round(r['avg_daily_return'], 6))}
-            for _, r in top.iterrows()
-        ],
-        'bottom_sectors': [
-            {'sector': r['sector'], 'avg_daily_return': _safe_val(round(r['avg_daily_return'], 6))}
-            for _, r in bottom.iterrows()
-        ],
+        'top_sectors': _to_records(top),
+        'bottom_sectors': _to_records(bottom),
     }
 
 
@@ -162,122 +188,258 @@ def build_focus_summary(market):
     df = _read(market, 'out', 'focus_top_bottom.csv')
     if df is None or df.empty:
         return []
+    # Single grouped pass: keep the first 3 rows per (focus, rank_type) instead
+    # of re-masking the whole frame for every focus.
+    head = df.groupby(['focus', 'rank_type'], sort=False).head(3)
+
+    def _records(sub):
+        return [
+            {'sector': r['sector'], 'metric': r['metric'], 'value': _safe_val(round(r['value'], 6)) if r.get('value') else None}
+            for r in sub[['sector', 'metric', 'value']].to_dict('records')
+        ]
+
     results = []
-    for focus in df['focus'].unique():
-        sub = df[df['focus'] == focus]
-        tops = sub[sub['rank_type'] == 'Top'][['sector', 'metric', 'value']].to_dict('records')
-        bots = sub[sub['rank_type'] == 'Bottom'][['sector', 'metric', 'value']].to_dict('records')
+    for focus, sub in head.groupby('focus', sort=False):
         results.append({
             'focus': focus,
-            'top_sectors': [
-                {'sector': r['sector'], 'metric': r['metric'], 'value': _safe_val(round(r['value'], 6)) if r.get('value') else None}
-                for r in tops[:3]
-            ],
-            'bottom_sectors': [
-                {'sector': r['sector'], 'metric': r['metric'], 'value': _safe_val(round(r['value'], 6)) if r.get('value') else None}
-                for r in bots[:3]
-            ],
+            'top_sectors': _records(sub[sub['rank_type'] == 'Top']),
+            'bottom_sectors': _records(sub[sub['rank_type'] == 'Bottom']),
         })
     return results
 
 
-def build_momentum_snapshot(market, windows=(21, 63, 126)):
+def build_momentum_snapshot(market, windows=CYCLE_WINDOWS):
     """Latest sector momentum ranks."""
     df = _read(market, 'out', 'sector_cycle_rank.csv')
     if df is None or df.empty:
         return {}
-    df['date'] = pd.to_datetime(df['date'])
+    df['date'] = to_datetime_col(df['date'])
     latest_date = df['date'].max()
     latest = df[df['date'] == latest_date].copy()
 
-    snapshot = {'date': str(latest_date.date()), 'sectors': {}}
-    for _, row in latest.iterrows():
-        sector = row['sector']
-        if sector not in snapshot['sectors']:
-            snapshot['sectors'][sector] = {}
-        for w in windows:
-            mom_col = f'mom_{w}'
-            rank_col = f'rank_{w}'
-            if mom_col in row.index and rank_col in row.index:
-                snapshot['sectors'][sector][f'mom_{w}'] = _safe_val(round(row[mom_col], 5)) if pd.notna(row[mom_col]) else None
-                snapshot['sectors'][sector][f'rank_{w}'] = _safe_val(row[rank_col])
+    pairs = [(f'mom_{w}', f'rank_{w}') for w in windows if f'mom_{w}' in latest and f'rank_{w}' in latest]
+    mom_cols = [mom for mom, _ in pairs]
+    cols = [c for pair in pairs for c in pair]
+    latest[mom_cols] = latest[mom_cols].round(5)
+
+    sectors = {}
+    for rec in _to_records(latest[['sector'] + cols]):
+        sectors.setdefault(rec.pop('sector'), {}).update(rec)
+    snapshot = {'date': str(latest_date.date()), 'sectors': sectors}
     return snapshot
 
 
-def build_data_quality(market):
-    """Data quality metrics."""
-    events = _read(market, 'data', 'macro_events.csv')
-    if events is None:
-        return {}
+_EVENT_COLS = ('event_type', 'event_date', 'actual_value', 'expected_value')
+RECENT_EVENTS_N = 10
 
-    total = len(events)
-    has_actual = events['actual_value'].notna().sum()
-    has_expected = events['expected_value'].notna().sum()
 
-    # Date range
-    events['event_date'] = pd.to_datetime(events['event_date'], errors='coerce')
-    min_date = str(events['event_date'].min().date()) if events['event_date'].notna().any() else None
-    max_date = str(events['event_date'].max().date()) if events['event_date'].notna().any() else None
+def _scan_events(market, n=RECENT_EVENTS_N):
+    """Single chunked pass over data/{market}/macro_events.csv.
 
-    # Event types with no actual data
-    by_type = events.groupby('event_type')['actual_value'].apply(lambda s: s.notna().sum())
-    empty_types = by_type[by_type == 0].index.tolist()
+    Feeds both build_data_quality and build_recent_events, so the file is
+    parsed once per summary build. The result is memoised in-process on the
+    file's (mtime_ns, size) and today's date; --force clears it.
+
+    Trade-off: this is the largest input, and it deliberately bypasses the
+    Parquet sidecar cache (read_csv_cached). Streaming keeps memory flat,
+    but every build that needs these sections re-parses the CSV.
 
-    # Recent 30d fill rate
+    Args:
+        n: Recent filled events to keep. At least RECENT_EVENTS_N, so the
+           default build still shares one scan between both sections.
+
+    Returns:
+        dict with 'quality' (dict) and 'recent' (DataFrame), or None if the
+        file is missing or unreadable.
+    """
+    path = os.path.join(BASE, 'data', market, 'macro_events.csv')
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    today = datetime.now().strftime('%Y-%m-%d')
+    return _scan_events_file(path, st.st_mtime_ns, st.st_size, today, max(n, RECENT_EVENTS_N))
+
+
+@lru_cache(maxsize=4)
+def _scan_events_file(path, mtime_ns, size, today, n=RECENT_EVENTS_N, chunksize=50_000):
+    total = has_actual = has_expected = 0
+    recent_total = recent_actual = 0
+    min_d = max_d = None
+    by_type = Counter()
+    latest = None  # running top-N filled events by date
     cutoff = pd.Timestamp.now() - pd.Timedelta(days=30)
-    recent = events[events['event_date'] >= cutoff]
-    recent_fill = recent['actual_value'].notna().mean() if len(recent) > 0 else None
 
-    return {
+    try:
+        reader = pd.read_csv(path, encoding='utf-8-sig', chunksize=chunksize,
+                             usecols=lambda c: c in _EVENT_COLS)
+        with reader:
+            for chunk in reader:
+                actual = chunk['actual_value'].notna()
+                total += len(chunk)
+                has_actual += int(actual.sum())
+                if 'expected_value' in chunk:
+                    has_expected += int(chunk['expected_value'].notna().sum())
+
+                # Date range
+                chunk['event_date'] = to_datetime_col(chunk['event_date'])
+                dates = chunk['event_date']
+                if dates.notna().any():
+                    lo, hi = dates.min(), dates.max()
+                    min_d = lo if min_d is None else min(min_d, lo)
+                    max_d = hi if max_d is None else max(max_d, hi)
+
+                # Per-type non-null actual counts (0 entries are kept)
+                by_type.update(actual.groupby(chunk['event_type']).sum().to_dict())
+
+                recent = dates >= cutoff
+                recent_total += int(recent.sum())
+                recent_actual += int((recent & actual).sum())
+
+                filled = chunk[actual] if latest is None else pd.concat([latest, chunk[actual]])
+                latest = filled.sort_values('event_date', ascending=False, kind='stable').head(n)
+    except (KeyError, ValueError, pd.errors.ParserError, UnicodeDecodeError):
+        return None
+
+    # Event types with no actual data
+    empty_types = sorted(et for et, cnt in by_type.items() if cnt == 0)
+    min_date = str(min_d.date()) if min_d is not None else None
+    max_date = str(max_d.date()) if max_d is not None else None
+    recent_fill = recent_actual / recent_total if recent_total else None
+
+    quality = {
         'total_events': int(total),
-        'actual_fill_rate': round(int(has_actual) / total, 3) if total else 0,
-        'expected_fill_rate': round(int(has_expected) / total, 3) if total else 0,
+        'actual_fill_rate': round(has_actual / total, 3) if total else 0,
+        'expected_fill_rate': round(has_expected / total, 3) if total else 0,
         'date_range': f'{min_date} ~ {max_date}',
         'event_types_no_data': empty_types,
         'recent_30d_fill_rate': round(float(recent_fill), 3) if recent_fill is not None else None,
     }
+    return {'quality': quality, 'recent': latest}
 
 
-def build_recent_events(market, n=10):
+def build_data_quality(market):
+    """Data quality metrics.
+
+    Streams macro_events.csv in chunks and only keeps running counters, so
+    memory stays flat regardless of how long the event history grows.
+    """
+    scan = _scan_events(market)
+    return scan['quality'] if scan else {}
+
+
+def build_recent_events(market, n=RECENT_EVENTS_N):
     """Most recent N events with actual values."""
-    events = _read(market, 'data', 'macro_events.csv')
-    if events is None:
+    scan = _scan_events(market, n)
+    if not scan or scan['recent'] is None:
         return []
-    events['event_date'] = pd.to_datetime(events['event_date'], errors='coerce')
-    filled = events.dropna(subset=['actual_value']).sort_values('event_date', ascending=False).head(n)
-    return [
-        {
-            'event_type': row['event_type'],
-            'date': str(row['event_date'].date()),
-            'actual': _safe_val(row['actual_value']),
-            'expected': _safe_val(row['expected_value']) if pd.notna(row.get('expected_value')) else None,
-        }
-        for _, row in filled.iterrows()
-    ]
+    filled = scan['recent'].head(n)
+    recent = pd.DataFrame({
+        'event_type': filled['event_type'],
+        'date': filled['event_date'].dt.strftime('%Y-%m-%d'),
+        'actual': filled['actual_value'],
+        'expected': filled['expected_value'] if 'expected_value' in filled else None,
+    })
+    return _to_records(recent)
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def build_summary(market):
+# section → (builder, input files as (folder, fname)). A section is rebuilt
+# only when one of its inputs changed (mtime/size) since the last summary.
+SECTIONS = {
+    'meta': (build_meta, [('out', 'macro_impact_meta.json')]),
+    'data_quality': (build_data_quality, [('data', 'macro_events.csv')]),
+    'significant_impacts': (build_significant_impacts, [('out', 'macro_impact.csv')]),
+    'current_regime': (build_regime_sectors, [('data', 'macro_regimes.csv'),
+                                              ('out', 'sector_cycle_regime_avg.csv')]),
+    'focus_events': (build_focus_summary, [('out', 'focus_top_bottom.csv')]),
+    'momentum_snapshot': (build_momentum_snapshot, [('out', 'sector_cycle_rank.csv')]),
+    'recent_events': (build_recent_events, [('data', 'macro_events.csv')]),
+}
+
+# Sections that also depend on today's date (recent_30d_fill_rate)
+_DATE_DEPENDENT = {'data_quality'}
+
+MANIFEST_NAME = '.summary_manifest.json'
+# Bump when a section's output format changes; edits to this script or to
+# config_defaults.py (builder code, top_n, windows) invalidate automatically
+MANIFEST_VERSION = 1
+
+
+def _manifest_version():
+    """MANIFEST_VERSION plus a fingerprint of the code that builds the sections."""
+    h = hashlib.sha1()
+    for mod in (__file__, config_defaults.__file__):
+        with open(mod, 'rb') as f:
+            h.update(f.read())
+    return f'{MANIFEST_VERSION}:{h.hexdigest()[:12]}'
+
+
+def _section_signature(market, name):
+    """[[relpath, mtime_ns, size], ...] for a section's inputs (None if missing)."""
+    sig = []
+    for folder, fname in SECTIONS[name][1]:
+        try:
+            st = os.stat(os.path.join(BASE, folder, market, fname))
+            sig.append([f'{folder}/{fname}', st.st_mtime_ns, st.st_size])
+        except OSError:
+            sig.append([f'{folder}/{fname}', None, None])
+    if name in _DATE_DEPENDENT:
+        sig.append(['today', datetime.now().strftime('%Y-%m-%d'), None])
+    return sig
+
+
+def _load_previous(market):
+    """Previous (summary, manifest) pair, or empty dicts if unreadable."""
+    try:
+        return (_read_json(market, 'out', 'summary.json') or {},
+                _read_json(market, 'out', MANIFEST_NAME) or {})
+    except (OSError, ValueError):
+        return {}, {}
+
+
+def _invalidate_inputs(market):
+    """--force: drop cached parses so every section re-reads its source CSVs."""
+    _scan_events_file.cache_clear()
+    for _, inputs in SECTIONS.values():
+        for folder, fname in inputs:
+            if fname.endswith('.csv'):
+                invalidate_csv_cache(os.path.join(BASE, folder, market, fname))
+
+
+def build_summary(market, force=False):
+    if force:
+        _invalidate_inputs(market)
+    prev, manifest = ({}, {}) if force else _load_previous(market)
+    version = _manifest_version()
+    if manifest.get('version') != version:
+        prev = {}  # builder code changed: nothing from the last run is reusable
+
     summary = {
         'market': market,
         'summary_generated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-        'meta': build_meta(market),
-        'data_quality': build_data_quality(market),
-        'significant_impacts': build_significant_impacts(market),
-        'current_regime': build_regime_sectors(market),
-        'focus_events': build_focus_summary(market),
-        'momentum_snapshot': build_momentum_snapshot(market),
-        'recent_events': build_recent_events(market),
     }
-
-    out_path = os.path.join(BASE, 'out', market, 'summary.json')
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
-    print(f'[{market.upper()}] summary.json written → {out_path}')
+    new_manifest = {'version': version}
+    reused = []
+    for name, (builder, _) in SECTIONS.items():
+        sig = _section_signature(market, name)
+        new_manifest[name] = sig
+        if name in prev and manifest.get(name) == sig:
+            summary[name] = prev[name]
+            reused.append(name)
+        else:
+            summary[name] = builder(market)
+
+    out_dir = os.path.join(BASE, 'out', market)
+    out_path = os.path.join(out_dir, 'summary.json')
+    os.makedirs(out_dir, exist_ok=True)
+    _write_json(out_path, summary)
+    _write_json(os.path.join(out_dir, MANIFEST_NAME), new_manifest)
+    note = f' (unchanged: {", ".join(reused)})' if reused else ''
+    print(f'[{market.upper()}] summary.json written → {out_path}{note}')
     return summary
 
 
@@ -285,11 +447,13 @@ def main():
     parser = argparse.ArgumentParser(description='Build pipeline summary JSON')
     parser.add_argument('--market', choices=['us', 'kr'], default=None,
                         help='Market to summarize (default: both)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every section even if its inputs are unchanged')
     args = parser.parse_args()
 
     markets = [args.market] if args.market else ['us', 'kr']
     for m in markets:
-        build_summary(m)
+        build_summary(m, force=args.force)
     print('Done.')
 
 
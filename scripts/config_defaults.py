@@ -5,18 +5,26 @@ Centralises magic numbers that are currently scattered across nightly.yml
 CLI arguments. Scripts and the workflow file should reference these values
 so that a single change here propagates everywhere.
 
+Window constants are tuples so they cannot be mutated by an importer and can
+be used directly as lru_cache keys. PipelineConfig bundles the defaults into
+a single frozen (hashable) object for helpers that take the whole config.
+
 Usage example:
     from config_defaults import CYCLE_WINDOWS, ANALYSIS_WINDOWS, LAST_DAYS, LAST_EVENTS
     parser.add_argument('--cycle-windows', default=','.join(map(str, CYCLE_WINDOWS)))
+
+    from config_defaults import PipelineConfig
+    cfg = PipelineConfig(last_days=90)   # override one field, keep the rest
 """
+from dataclasses import dataclass
 
 # ── Momentum / cycle lookback windows (trading days) ──────────────────────────
 # Used by: build_reaction_matrix.py (--cycle-windows), join_cycles_into_reactions.py
-CYCLE_WINDOWS: list[int] = [21, 63, 126]   # ~1 month, 3 months, 6 months
+CYCLE_WINDOWS: tuple[int, ...] = (21, 63, 126)   # ~1 month, 3 months, 6 months
 
 # ── Additional return windows (trading days, half-window) ─────────────────────
 # Used by: compute_additional_windows.py (--windows)
-ANALYSIS_WINDOWS: list[int] = [5, 10, 21]  # ±5d, ±10d, ±21d
+ANALYSIS_WINDOWS: tuple[int, ...] = (5, 10, 21)  # ±5d, ±10d, ±21d
 
 # ── Event filter defaults ──────────────────────────────────────────────────────
 # Used by: compute_reaction_by_surprise_quantile.py, analyze_focus_events.py
@@ -45,3 +53,17 @@ BOK_TIMEOUT_SEC: int = 20
 FRED_TIMEOUT_SEC: int = 20
 MAX_RETRY_ATTEMPTS: int = 5
 PRICE_COVERAGE_WARN_THRESHOLD: float = 0.30  # warn if <30% of expected trading days fetched
+
+
+# ── Bundled defaults ──────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class PipelineConfig:
+    """Immutable snapshot of the defaults above; hashable, so usable as a cache key."""
+    cycle_windows: tuple[int, ...] = CYCLE_WINDOWS
+    analysis_windows: tuple[int, ...] = ANALYSIS_WINDOWS
+    last_days: int = LAST_DAYS
+    last_events: int = LAST_EVENTS
+    dashboard_last_days: int = DASHBOARD_LAST_DAYS
+    dashboard_last_events: int = DASHBOARD_LAST_EVENTS
+    fdr_alpha: float = FDR_ALPHA
+    min_sample_regression: int = MIN_SAMPLE_REGRESSION
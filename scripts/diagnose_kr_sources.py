@@ -4,10 +4,15 @@
 Usage:
     python scripts/diagnose_kr_sources.py --data-dir data/kr
 """
+import io
 import os
 import sys
 import argparse
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import quote
 
 # Reuse helpers from the fetch script
 sys.path.insert(0, os.path.dirname(__file__))
@@ -18,6 +23,12 @@ from fetch_macro_from_bok_kosis import (
 
 logger = logging.getLogger(__name__)
 
+# Per-source diagnoses are I/O-bound HTTP calls; run this many concurrently
+MAX_WORKERS = 8
+
+# Sources sharing a stat_code request the same ITEM_CODE1 listing URL
+_fetch_json_cached = lru_cache(maxsize=256)(fetch_json)
+
 EXPECTED_RANGES = {
     'CPI_YOY':      (-5, 20),
     'PPI_YOY':      (-10, 30),
@@ -37,6 +48,78 @@ EXPECTED_RANGES = {
 }
 
 
+def _diagnose_bok_source(src, api_key):
+    """Diagnose one BOK source; returns its report text."""
+    out = io.StringIO()
+    p = partial(print, file=out)
+
+    et = src.get('event_type', '?')
+    stat_code = (src.get('stat_code') or '').strip()
+    item_code1 = (src.get('item_code1') or '').strip() or None
+    cycle = (src.get('cycle') or 'M').strip() or 'M'
+    need_yoy = (src.get('compute_yoy') or '').strip().upper() == 'Y'
+
+    p(f'\n--- {et} ---')
+    p(f'  stat_code={stat_code}  item_code1={item_code1}  cycle={cycle}  compute_yoy={need_yoy}')
+
+    if not stat_code:
+        p('  SKIP: no stat_code')
+        return out.getvalue()
+
+    try:
+        # Fetch recent 24 months without item_code1 filter to see all items
+        series_all = fetch_bok_series(api_key, stat_code, cycle, '202301', '202602')
+        p(f'  Raw series (no filter): {len(series_all)} entries')
+        # Show last 3
+        sorted_keys = sorted(heapq.nlargest(3, series_all))
+        for k in sorted_keys:
+            p(f'    {k} = {series_all[k]}')
+
+        # Also fetch with item_code1 filter
+        if item_code1:
+            series_filtered = fetch_bok_series(api_key, stat_code, cycle, '202301', '202602', item_code1=item_code1)
+            p(f'  Filtered (item_code1={item_code1}): {len(series_filtered)} entries')
+            sorted_keys = sorted(heapq.nlargest(3, series_filtered))
+            for k in sorted_keys:
+                p(f'    {k} = {series_filtered[k]}')
+
+            if need_yoy and sorted_keys:
+                yoy = compute_yoy_from_series(series_filtered, sorted_keys[-1])
+                p(f'  YoY for {sorted_keys[-1]}: {yoy}')
+
+        # Also try listing available ITEM_CODE1 values
+        list_url = f"https://ecos.bok.or.kr/api/StatisticSearch/{quote(api_key)}/json/kr/1/20/{quote(stat_code)}/{quote(cycle)}/202501/202501"
+        resp_data = _fetch_json_cached(list_url)
+        rows = resp_data.get('StatisticSearch', {}).get('row', [])
+        if rows:
+            p(f'  Available ITEM_CODE1 values (sample month 202501):')
+            seen = set()
+            for r in rows[:20]:
+                ic1 = r.get('ITEM_CODE1', '')
+                nm = r.get('ITEM_NAME1', '')
+                val = r.get('DATA_VALUE', '')
+                key = (ic1, nm)
+                if key not in seen:
+                    seen.add(key)
+                    p(f'    ITEM_CODE1={ic1}  NAME={nm}  VALUE={val}')
+
+        # Range check
+        lo, hi = EXPECTED_RANGES.get(et, (None, None))
+        if lo is not None and series_all:
+            last_key = max(series_all)
+            last_val = series_all[last_key]
+            if need_yoy:
+                last_val = compute_yoy_from_series(series_all, last_key)
+            if last_val is not None:
+                in_range = lo <= last_val <= hi
+                status = 'OK' if in_range else 'OUT OF RANGE'
+                p(f'  Range check [{lo}, {hi}]: {last_val} -> {status}')
+
+    except Exception as e:
+        p(f'  ERROR: {e}')
+    return out.getvalue()
+
+
 def diagnose_bok(sources, api_key):
     """Diagnose all BOK sources."""
     bok_sources = [s for s in sources if (s.get('source') or '').upper() == 'BOK']
@@ -48,74 +131,66 @@ def diagnose_bok(sources, api_key):
     print('BOK ECOS API Diagnosis')
     print('=' * 70)
 
-    for src in bok_sources:
-        et = src.get('event_type', '?')
-        stat_code = (src.get('stat_code') or '').strip()
-        item_code1 = (src.get('item_code1') or '').strip() or None
-        cycle = (src.get('cycle') or 'M').strip() or 'M'
-        need_yoy = (src.get('compute_yoy') or '').strip().upper() == 'Y'
+    # Sources are independent network round-trips; reports print in config order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        for report in ex.map(lambda src: _diagnose_bok_source(src, api_key), bok_sources):
+            print(report, end='')
 
-        print(f'\n--- {et} ---')
-        print(f'  stat_code={stat_code}  item_code1={item_code1}  cycle={cycle}  compute_yoy={need_yoy}')
 
-        if not stat_code:
-            print('  SKIP: no stat_code')
-            continue
+def _diagnose_kosis_source(src, api_key):
+    """Diagnose one KOSIS source; returns its report text."""
+    out = io.StringIO()
+    p = partial(print, file=out)
 
-        try:
-            # Fetch recent 24 months without item_code1 filter to see all items
-            series_all = fetch_bok_series(api_key, stat_code, cycle, '202301', '202602')
-            print(f'  Raw series (no filter): {len(series_all)} entries')
-            # Show last 3
-            sorted_keys = sorted(series_all.keys())[-3:]
-            for k in sorted_keys:
-                print(f'    {k} = {series_all[k]}')
-
-            # Also fetch with item_code1 filter
-            if item_code1:
-                series_filtered = fetch_bok_series(api_key, stat_code, cycle, '202301', '202602', item_code1=item_code1)
-                print(f'  Filtered (item_code1={item_code1}): {len(series_filtered)} entries')
-                sorted_keys = sorted(series_filtered.keys())[-3:]
-                for k in sorted_keys:
-                    print(f'    {k} = {series_filtered[k]}')
-
-                if need_yoy and sorted_keys:
-                    yoy = compute_yoy_from_series(series_filtered, sorted_keys[-1])
-                    print(f'  YoY for {sorted_keys[-1]}: {yoy}')
-
-            # Also try listing available ITEM_CODE1 values
-            from urllib.request import urlopen
-            from urllib.parse import quote
-            import json
-            list_url = f"https://ecos.bok.or.kr/api/StatisticSearch/{quote(api_key)}/json/kr/1/20/{quote(stat_code)}/{quote(cycle)}/202501/202501"
-            resp_data = fetch_json(list_url)
-            rows = resp_data.get('StatisticSearch', {}).get('row', [])
-            if rows:
-                print(f'  Available ITEM_CODE1 values (sample month 202501):')
-                seen = set()
-                for r in rows[:20]:
-                    ic1 = r.get('ITEM_CODE1', '')
-                    nm = r.get('ITEM_NAME1', '')
-                    val = r.get('DATA_VALUE', '')
-                    key = (ic1, nm)
-                    if key not in seen:
-                        seen.add(key)
-                        print(f'    ITEM_CODE1={ic1}  NAME={nm}  VALUE={val}')
-
-            # Range check
-            lo, hi = EXPECTED_RANGES.get(et, (None, None))
-            if lo is not None and series_all:
-                last_val = list(series_all.values())[-1]
-                if need_yoy:
-                    sk = sorted(series_all.keys())
-                    last_val = compute_yoy_from_series(series_all, sk[-1]) if sk else None
-                if last_val is not None:
-                    in_range = lo <= last_val <= hi
-                    status = 'OK' if in_range else 'OUT OF RANGE'
-                    print(f'  Range check [{lo}, {hi}]: {last_val} -> {status}')
+    et = src.get('event_type', '?')
+    org_id = (src.get('org_id') or '').strip()
+    tbl_id = (src.get('tbl_id') or '').strip()
+    itm_id = (src.get('itm_id') or '').strip()
+    prd_se = (src.get('prd_se') or 'M').strip() or 'M'
+    need_yoy = (src.get('compute_yoy') or '').strip().upper() == 'Y'
+    param_mode = (src.get('param_mode') or '').strip().upper() == 'Y'
 
-        except Exception as e:
-            print(f'  ERROR: {e}')
+    obj_params = {f'objL{i}': (src.get(f'objL{i}') or '').strip() for i in range(1, 9)}
+    obj_str = ', '.join(f'{k}={v}' for k, v in obj_params.items() if v)
+
+    p(f'\n--- {et} ---')
+    p(f'  org_id={org_id}  tbl_id={tbl_id}  itm_id={itm_id}  prd_se={prd_se}')
+    p(f'  param_mode={param_mode}  compute_yoy={need_yoy}  obj_params: {obj_str}')
+
+    if not all([org_id, tbl_id, itm_id]):
+        p('  SKIP: incomplete parameters')
+        return out.getvalue()
+
+    try:
+        if prd_se == 'Q':
+            start, end = '2023Q1', '2025Q4'
+        else:
+            start, end = '202301', '202602'
+
+        series = fetch_kosis_series_param(api_key, org_id, tbl_id, itm_id, prd_se, start, end, obj_params)
+        p(f'  Series: {len(series)} entries')
+        sorted_keys = sorted(heapq.nlargest(5, series))
+        for k in sorted_keys:
+            p(f'    {k} = {series[k]}')
+
+        if need_yoy and sorted_keys:
+            yoy = compute_yoy_from_series(series, sorted_keys[-1])
+            p(f'  YoY for {sorted_keys[-1]}: {yoy}')
+
+        # Range check
+        lo, hi = EXPECTED_RANGES.get(et, (None, None))
+        if lo is not None and series:
+            last_val = series[sorted_keys[-1]] if sorted_keys else None
+            if need_yoy:
+                last_val = compute_yoy_from_series(series, sorted_keys[-1]) if sorted_keys else None
+            if last_val is not None:
+                in_range = lo <= last_val <= hi
+                status = 'OK' if in_range else 'OUT OF RANGE'
+                p(f'  Range check [{lo}, {hi}]: {last_val} -> {status}')
+
+    except Exception as e:
+        p(f'  ERROR: {e}')
+    return out.getvalue()
 
 
 def diagnose_kosis(sources, api_key):
@@ -129,55 +204,9 @@ def diagnose_kosis(sources, api_key):
     print('KOSIS API Diagnosis')
     print('=' * 70)
 
-    for src in kosis_sources:
-        et = src.get('event_type', '?')
-        org_id = (src.get('org_id') or '').strip()
-        tbl_id = (src.get('tbl_id') or '').strip()
-        itm_id = (src.get('itm_id') or '').strip()
-        prd_se = (src.get('prd_se') or 'M').strip() or 'M'
-        need_yoy = (src.get('compute_yoy') or '').strip().upper() == 'Y'
-        param_mode = (src.get('param_mode') or '').strip().upper() == 'Y'
-
-        obj_params = {f'objL{i}': (src.get(f'objL{i}') or '').strip() for i in range(1, 9)}
-        obj_str = ', '.join(f'{k}={v}' for k, v in obj_params.items() if v)
-
-        print(f'\n--- {et} ---')
-        print(f'  org_id={org_id}  tbl_id={tbl_id}  itm_id={itm_id}  prd_se={prd_se}')
-        print(f'  param_mode={param_mode}  compute_yoy={need_yoy}  obj_params: {obj_str}')
-
-        if not all([org_id, tbl_id, itm_id]):
-            print('  SKIP: incomplete parameters')
-            continue
-
-        try:
-            if prd_se == 'Q':
-                start, end = '2023Q1', '2025Q4'
-            else:
-                start, end = '202301', '202602'
-
-            series = fetch_kosis_series_param(api_key, org_id, tbl_id, itm_id, prd_se, start, end, obj_params)
-            print(f'  Series: {len(series)} entries')
-            sorted_keys = sorted(series.keys())[-5:]
-            for k in sorted_keys:
-                print(f'    {k} = {series[k]}')
-
-            if need_yoy and sorted_keys:
-                yoy = compute_yoy_from_series(series, sorted_keys[-1])
-                print(f'  YoY for {sorted_keys[-1]}: {yoy}')
-
-            # Range check
-            lo, hi = EXPECTED_RANGES.get(et, (None, None))
-            if lo is not None and series:
-                last_val = list(series.values())[-1] if sorted_keys else None
-                if need_yoy:
-                    last_val = compute_yoy_from_series(series, sorted_keys[-1]) if sorted_keys else None
-                if last_val is not None:
-                    in_range = lo <= last_val <= hi
-                    status = 'OK' if in_range else 'OUT OF RANGE'
-                    print(f'  Range check [{lo}, {hi}]: {last_val} -> {status}')
-
-        except Exception as e:
-            print(f'  ERROR: {e}')
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        for report in ex.map(lambda src: _diagnose_kosis_source(src, api_key), kosis_sources):
+            print(report, end='')
 
 
 def diagnose_market(sources):
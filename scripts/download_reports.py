@@ -26,6 +26,8 @@ CATEGORY_ID = '1521'
 # 저장 경로 (경제 리포트)
 SAVE_DIR = os.path.join(os.path.expanduser('~'), 'Documents', 'MACRO-DATA',
                         '\uacbd\uc81c \ub9ac\ud3ec\ud2b8')
+# Windows 파일명 금지 문자 → '_' (str.translate 단일 C 루프)
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('\\/:*?"<>|', '_'))
 
 
 def _headers():
@@ -165,7 +167,7 @@ def safe_filename(date, title, pdf_url):
         att_m = re.search(r'/(\d+)\.pdf', pdf_url)
     att_id = att_m.group(1) if att_m else '0'
     # 한글 파일명 안전 처리: ASCII + 한글(유니코드) 모두 허용, 특수문자만 치환
-    safe = re.sub(r'[\\/:*?"<>|]', '_', title)
+    safe = title.translate(_FILENAME_TRANS)
     safe = re.sub(r'\s+', ' ', safe).strip()[:70]
     # 파일명 인코딩 테스트 (Windows 경로 안전성)
     try:
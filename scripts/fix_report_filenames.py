@@ -5,6 +5,7 @@ from urllib.request import urlopen, Request
 FOLDER = os.path.join(os.path.expanduser('~'), 'Documents', 'MACRO-DATA', '\uacbd\uc81c \ub9ac\ud3ec\ud2b8')
 BASE = 'https://securities.miraeasset.com'
 LIST = BASE + '/bbs/board/message/list.do'
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('\\/:*?"<>|', '_'))
 
 
 def fetch(url):
@@ -69,7 +70,7 @@ def collect_all():
 
 
 def safe_title(title):
-    s = re.sub(r'[\\/:*?"<>|]', '_', title)
+    s = title.translate(_FILENAME_TRANS)
     return re.sub(r'\s+', ' ', s).strip()[:70]
 
 
@@ -5,11 +5,24 @@ All scripts should prefer these helpers over ad-hoc datetime.strptime or
 pd.to_datetime calls to ensure consistent behaviour across the codebase.
 """
 from datetime import datetime, date
+from functools import lru_cache
 import pandas as pd
 
 
 def to_date(s: str) -> date | None:
-    """Parse a 'YYYY-MM-DD' string to datetime.date. Returns None on failure."""
+    """Parse a 'YYYY-MM-DD' string to datetime.date. Returns None on failure.
+
+    Memoised: long-format CSVs repeat each date string once per ticker/sector,
+    so strptime only runs once per distinct value.
+    """
+    try:
+        return _to_date_cached(s)
+    except TypeError:  # unhashable input cannot be a cache key
+        return None
+
+
+@lru_cache(maxsize=16384)
+def _to_date_cached(s):
     if not s:
         return None
     try:
@@ -21,14 +34,16 @@ def to_date(s: str) -> date | None:
 def to_datetime_col(series: pd.Series) -> pd.Series:
     """Parse a pandas Series of date strings to datetime64.
 
-    Tries the strict '%Y-%m-%d' format first; falls back to pandas inference
-    with errors='coerce' so that unparseable values become NaT instead of
-    raising an exception.
+    Uses the fast strict '%Y-%m-%d' format first. Entries it cannot read
+    (e.g. '2024-01-15 00:00:00', '2024/01/15') are re-parsed with pandas
+    inference, and only values that fail both become NaT — never an
+    exception.
     """
-    try:
-        return pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
-    except Exception:
-        return pd.to_datetime(series, errors='coerce')
+    parsed = pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
+    missed = parsed.isna() & series.notna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(series[missed], format='mixed', errors='coerce')
+    return parsed
 
 
 def yyyymm(d: date) -> str:
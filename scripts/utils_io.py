@@ -5,7 +5,7 @@ Provides read/write functions that support both CSV (current default) and
 Parquet (future default for 50%+ storage savings and faster I/O).
 
 Usage:
-    from utils_io import read_df, write_df
+    from utils_io import read_df, write_df, read_csv_cached
 
     # reads .parquet if it exists, falls back to .csv
     df = read_df('out/us/reaction_long')
@@ -13,20 +13,49 @@ Usage:
     # writes both .parquet and .csv by default (safe migration period)
     write_df(df, 'out/us/reaction_long')
 
-Set USE_PARQUET=1 environment variable (or pass fmt='parquet') to opt into
+    # parses the CSV once, then serves out/us/macro_impact.csv.parquet until
+    # the CSV is modified again
+    df = read_csv_cached('out/us/macro_impact.csv')
+
+Set USE_PARQUET=1 environment variable (or pass fmt='parquet', also_csv=False) to opt into
 Parquet-only mode once all consumers are updated.
 """
 import os
+import inspect
 import logging
+import tempfile
 
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-# Opt-in: set env var USE_PARQUET=1 to write Parquet instead of CSV.
+# Opt-in: set env var USE_PARQUET=1 to write Parquet only (no CSV sidecar).
 # During the migration period, write_df writes BOTH formats by default.
 _USE_PARQUET = os.environ.get('USE_PARQUET', '0').strip() == '1'
 
+# Opt-in: set env var USE_PYARROW_CSV=1 to parse CSVs with the multithreaded
+# pyarrow reader first. Off by default because it returns ISO date columns as
+# datetime.date objects and empty strings as None instead of str/NaN.
+_USE_PYARROW_CSV = os.environ.get('USE_PYARROW_CSV', '0').strip() == '1'
+_CSV_ENGINES = ('pyarrow', 'c', 'python') if _USE_PYARROW_CSV else ('c', 'python')
+
+# write_df routes each kwarg only to the writer(s) that accept it, so CSV-only
+# options (float_format, date_format, quoting) never reach to_parquet
+_CSV_WRITE_KWARGS = frozenset(inspect.signature(pd.DataFrame.to_csv).parameters) - {'self'}
+_PARQUET_WRITE_KWARGS = frozenset(inspect.signature(pd.DataFrame.to_parquet).parameters) - {'self', 'kwargs'}
+
+# Parquet schema-metadata key holding the b'<mtime_ns>:<size>' of the CSV a
+# cache sidecar was built from
+_SOURCE_KEY = b'macro_data.source_csv'
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 
 def _parquet_available() -> bool:
     try:
@@ -67,49 +96,184 @@ def read_df(path_stem: str, fmt: str = 'auto', **kwargs) -> pd.DataFrame:
     if not os.path.exists(csv_path):
         logger.warning('File not found: %s(.csv/.parquet)', path_stem)
         return pd.DataFrame()
+    csv_kwargs = {'encoding': 'utf-8-sig', 'on_bad_lines': 'skip'}
+    csv_kwargs.update(kwargs)
+    # Fastest engine first; the python tokenizer (5-20x slower) is last resort
+    engines = (csv_kwargs.pop('engine'),) if 'engine' in csv_kwargs else _CSV_ENGINES
+    for engine in engines:
+        try:
+            df = pd.read_csv(csv_path, engine=engine, **csv_kwargs)
+            logger.debug('Read csv (%s engine): %s (%d rows)', engine, csv_path, len(df))
+            return df
+        except Exception as e:
+            logger.warning('CSV read (%s engine) failed for %s: %s', engine, csv_path, e)
+    logger.error('CSV read failed for %s', csv_path)
+    return pd.DataFrame()
+
+
+def _csv_key(csv_path: str) -> bytes | None:
+    """Identity of a CSV file's current contents: b'<mtime_ns>:<size>'."""
     try:
-        csv_kwargs = {'encoding': 'utf-8-sig', 'engine': 'python', 'on_bad_lines': 'skip'}
-        csv_kwargs.update(kwargs)
-        df = pd.read_csv(csv_path, **csv_kwargs)
-        logger.debug('Read csv: %s (%d rows)', csv_path, len(df))
-        return df
-    except Exception as e:
-        logger.error('CSV read failed for %s: %s', csv_path, e)
-        return pd.DataFrame()
+        st = os.stat(csv_path)
+    except OSError:
+        return None
+    return f'{st.st_mtime_ns}:{st.st_size}'.encode()
+
+
+def _parquet_source_key(parquet_path: str) -> bytes | None:
+    """Source CSV key stamped into a Parquet file by _write_parquet, or None."""
+    try:
+        import pyarrow.parquet as pq
+        return (pq.read_schema(parquet_path).metadata or {}).get(_SOURCE_KEY)
+    except Exception:
+        return None
+
+
+def _write_parquet(df: pd.DataFrame, parquet_path: str, source_key: bytes | None = None,
+                   index: bool = False, **kwargs) -> None:
+    """Write Parquet via a unique temp file + os.replace.
+
+    Readers never see a half-written file and concurrent writers never share a
+    temp path. With source_key the CSV it was derived from is stamped into the
+    schema metadata (pyarrow only), marking the file as a cache of that CSV.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(parquet_path) + '.',
+                                    dir=os.path.dirname(os.path.abspath(parquet_path)))
+    os.close(fd)
+    try:
+        if source_key is None:
+            df.to_parquet(tmp_path, index=index, **{'compression': 'zstd', **kwargs})
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=index)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_KEY: source_key})
+            pq.write_table(table, tmp_path, **{'compression': 'zstd', **kwargs})
+        os.replace(tmp_path, parquet_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_csv_cached(csv_path: str, **kwargs) -> pd.DataFrame:
+    """Read a CSV through a Parquet sidecar cache (<csv_path>.parquet).
+
+    The sidecar holds the result of parsing the CSV — not write_df's
+    <stem>.parquet, which is built from the in-memory frame and can differ
+    (index, datetime dtypes, float_format) — so a cached read always equals
+    pd.read_csv. It records the CSV's (mtime_ns, size) and is reused only on
+    an exact match, so restoring an older CSV with its original mtime (cp -p,
+    rsync -t, tar) is still picked up. Cache problems (no pyarrow, unwritable
+    directory, column types Arrow cannot hold) only cost the speed-up — CSV
+    parse errors still propagate to the caller.
+
+    Args:
+        csv_path: Path to the .csv file.
+        **kwargs: Passed through to pd.read_csv. Only the full-file parse is
+                  cached, so kwargs that change the result (usecols, dtype,
+                  nrows, ...) bypass the cache.
+    """
+    sidecar = csv_path + '.parquet'
+    use_cache = not kwargs and _pyarrow_available()
+    # Stat before parsing: a CSV rewritten mid-read then fails the next check
+    key = _csv_key(csv_path) if use_cache else None
+
+    if key is not None and _parquet_source_key(sidecar) == key:
+        try:
+            df = pd.read_parquet(sidecar)
+            logger.debug('Read parquet cache: %s (%d rows)', sidecar, len(df))
+            return df
+        except Exception as e:
+            logger.warning('Parquet cache read failed for %s: %s — re-parsing CSV', sidecar, e)
+
+    csv_kwargs = {'encoding': 'utf-8-sig'}
+    csv_kwargs.update(kwargs)
+    df = pd.read_csv(csv_path, **csv_kwargs)
+
+    if key is not None:
+        try:
+            _write_parquet(df, sidecar, source_key=key)
+        except Exception as e:
+            logger.debug('Parquet cache write skipped for %s: %s', sidecar, e)
+    return df
+
+
+def invalidate_csv_cache(csv_path: str) -> None:
+    """Delete csv_path's read_csv_cached sidecar so the next read re-parses.
+
+    Only stamped caches are removed; any other file is left alone.
+    """
+    sidecar = csv_path + '.parquet'
+    if _parquet_source_key(sidecar) is None:
+        return
+    try:
+        os.remove(sidecar)
+        logger.info('Removed parquet cache: %s', sidecar)
+    except OSError as e:
+        logger.warning('Could not remove parquet cache %s: %s', sidecar, e)
 
 
 def write_df(df: pd.DataFrame, path_stem: str, fmt: str = 'auto',
-             also_csv: bool = True, index: bool = False, **kwargs) -> None:
+             also_csv: bool | None = None, index: bool = False, **kwargs) -> None:
     """Write a DataFrame to Parquet and/or CSV.
 
     Args:
         df: DataFrame to write.
         path_stem: File path without extension.
         fmt: 'auto' (write Parquet when available + CSV), 'parquet', or 'csv'.
-        also_csv: When fmt='parquet', also write CSV for backwards compatibility.
+        also_csv: Also write CSV next to the Parquet file for consumers that
+                  still read CSV. Defaults to True, except fmt='auto' with
+                  USE_PARQUET=1, which writes Parquet only.
         index: Include DataFrame index in output (default False).
-        **kwargs: Passed through to write functions.
+        **kwargs: Passed to the writer that accepts them: to_csv options
+                  (float_format, quoting, ...) to the CSV only, to_parquet /
+                  engine options to the Parquet only, shared ones to both.
     """
     if df is None or df.empty:
         logger.warning('write_df: empty DataFrame, skipping write to %s', path_stem)
         return
 
     os.makedirs(os.path.dirname(os.path.abspath(path_stem)), exist_ok=True)
-    wrote_parquet = False
+    if also_csv is None:
+        also_csv = not (fmt == 'auto' and _USE_PARQUET)
+    csv_kwargs = {k: v for k, v in kwargs.items() if k in _CSV_WRITE_KWARGS}
+    parquet_kwargs = {k: v for k, v in kwargs.items()
+                      if k in _PARQUET_WRITE_KWARGS or k not in _CSV_WRITE_KWARGS}
+    parquet_path = path_stem + '.parquet'
+    csv_path = path_stem + '.csv'
+    want_parquet = fmt in ('auto', 'parquet') and _parquet_available()
+    wrote_csv = wrote_parquet = False
+
+    if fmt == 'csv' or also_csv or not want_parquet:
+        wrote_csv = _write_csv(df, csv_path, index=index, **csv_kwargs)
 
-    if (fmt in ('auto', 'parquet')) and _USE_PARQUET and _parquet_available():
-        parquet_path = path_stem + '.parquet'
+    if want_parquet:
         try:
-            df.to_parquet(parquet_path, index=index, **kwargs)
+            # zstd + dictionary encoding shrinks repeated event/sector strings 5-10x
+            _write_parquet(df, parquet_path, index=index, **parquet_kwargs)
             logger.info('Wrote parquet: %s (%d rows)', parquet_path, len(df))
             wrote_parquet = True
         except Exception as e:
             logger.warning('Parquet write failed for %s: %s — falling back to CSV', parquet_path, e)
 
-    if fmt == 'csv' or not wrote_parquet or also_csv:
-        csv_path = path_stem + '.csv'
-        try:
-            df.to_csv(csv_path, index=index, encoding='utf-8', **kwargs)
-            logger.debug('Wrote csv: %s (%d rows)', csv_path, len(df))
-        except Exception as e:
-            logger.error('CSV write failed for %s: %s', csv_path, e)
+    if not wrote_parquet:
+        if os.path.exists(parquet_path):
+            # read_df prefers .parquet; never leave an older one shadowing the new CSV
+            try:
+                os.remove(parquet_path)
+                logger.info('Removed stale parquet: %s', parquet_path)
+            except OSError as e:
+                logger.warning('Could not remove stale parquet %s: %s', parquet_path, e)
+        if not wrote_csv:
+            _write_csv(df, csv_path, index=index, **csv_kwargs)
+
+
+def _write_csv(df: pd.DataFrame, csv_path: str, index: bool = False, **kwargs) -> bool:
+    try:
+        df.to_csv(csv_path, index=index, encoding='utf-8', **kwargs)
+        logger.debug('Wrote csv: %s (%d rows)', csv_path, len(df))
+        return True
+    except Exception as e:
+        logger.error('CSV write failed for %s: %s', csv_path, e)
+        return False
@@ -48,11 +48,9 @@ def read_csv_safe(path):
         return None
     try:
         return pd.read_csv(path, encoding='utf-8-sig')
-    except Exception:
-        try:
-            return pd.read_csv(path)
-        except Exception:
-            return None
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        print(f'WARN: could not parse {path}: {e}')
+        return None
 
 
 def check_ranges(df, issues):
@@ -0,0 +1,218 @@
+"""Unit tests for scripts/build_summary.py — incremental rebuild and events scan."""
+import sys
+import os
+import json
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+_SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, os.path.abspath(_SCRIPTS_DIR))
+
+import build_summary  # noqa: E402
+import utils_io  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+_EVENTS = pd.DataFrame({
+    'event_id': range(12),
+    'event_type': ['CPI', 'NFP', 'GDP'] * 4,
+    'event_date': [f'2024-01-{d:02d}' for d in (1, 2, 3, 8, 9, 10, 15, 16, 17, 22, 23, 24)],
+    'expected_value': [0.1, None, None] * 4,
+    'actual_value': [float(i) if i % 3 != 2 else None for i in range(12)],
+})
+
+
+def _write_csv(root, folder, fname, df):
+    path = os.path.join(root, folder, 'us', fname)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+
+def _make_tree(root):
+    """Minimal data/ and out/ tree with one input per summary section."""
+    _write_csv(root, 'data', 'macro_events.csv', _EVENTS)
+    _write_csv(root, 'data', 'macro_regimes.csv', pd.DataFrame({
+        'regime': ['A', 'B'], 'start_date': ['2020-01-01', '2023-01-02'],
+        'end_date': ['2023-01-01', '2026-01-01']}))
+    _write_csv(root, 'out', 'macro_impact.csv', pd.DataFrame({
+        'event_type': ['CPI', 'NFP'], 'sector': ['XLK', 'XLF'], 'metric': ['t0_return_avg'] * 2,
+        'n': [30, 40], 'beta': [0.5, -0.2], 't_stat': [3.0, -4.0],
+        'p_adj_bh': [0.01, 0.001], 'significant_bh': [True, True]}))
+    _write_csv(root, 'out', 'sector_cycle_regime_avg.csv', pd.DataFrame({
+        'regime': ['B', 'B'], 'start_date': ['2023-01-02'] * 2, 'end_date': ['2026-01-01'] * 2,
+        'sector': ['XLK', 'XLF'], 'avg_daily_return': [0.002, 0.001]}))
+    _write_csv(root, 'out', 'focus_top_bottom.csv', pd.DataFrame({
+        'focus': ['CPI'], 'rank_type': ['Top'], 'sector': ['XLK'],
+        'metric': ['t0_return_avg'], 'value': [0.12]}))
+    _write_csv(root, 'out', 'sector_cycle_rank.csv', pd.DataFrame({
+        'date': ['2024-01-02'] * 2, 'sector': ['XLK', 'XLF'],
+        'mom_21': [0.1, 0.2], 'rank_21': [2, 1]}))
+    with open(os.path.join(root, 'out', 'us', 'macro_impact_meta.json'), 'w') as f:
+        json.dump({'generated_at': 'x', 'n_events': 12}, f)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    _make_tree(str(tmp_path))
+    monkeypatch.setattr(build_summary, 'BASE', str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Records which section builders actually run."""
+    ran = []
+    for name, (builder, inputs) in list(build_summary.SECTIONS.items()):
+        def wrapped(market, _builder=builder, _name=name):
+            ran.append(_name)
+            return _builder(market)
+        monkeypatch.setitem(build_summary.SECTIONS, name, (wrapped, inputs))
+    return ran
+
+
+def _bump(path):
+    """Move a file's mtime forward so its signature changes even within one clock tick."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+# ---------------------------------------------------------------------------
+# Incremental rebuild
+# ---------------------------------------------------------------------------
+
+def test_unchanged_inputs_reuse_every_section(tree, calls):
+    """Second build with untouched inputs runs no builder and returns the same sections."""
+    first = build_summary.build_summary('us')
+    assert calls == list(build_summary.SECTIONS)
+    calls.clear()
+    second = build_summary.build_summary('us')
+    assert calls == []
+    for name in build_summary.SECTIONS:
+        assert second[name] == first[name]
+
+
+def test_changed_input_rebuilds_only_its_section(tree, calls):
+    """Touching macro_impact.csv rebuilds significant_impacts and nothing else."""
+    build_summary.build_summary('us')
+    calls.clear()
+    path = _write_csv(tree, 'out', 'macro_impact.csv', pd.DataFrame({
+        'event_type': ['CPI'], 'sector': ['XLK'], 'metric': ['t0_return_avg'], 'n': [30],
+        'beta': [0.5], 't_stat': [9.0], 'p_adj_bh': [0.001], 'significant_bh': [True]}))
+    _bump(path)
+    summary = build_summary.build_summary('us')
+    assert calls == ['significant_impacts']
+    assert [r['t_stat'] for r in summary['significant_impacts']] == [9.0]
+
+
+def test_date_change_invalidates_data_quality(tree, calls, monkeypatch):
+    """data_quality depends on today's date (recent_30d_fill_rate) and is rebuilt the next day."""
+    build_summary.build_summary('us')
+    calls.clear()
+
+    class _Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2099, 1, 2, tzinfo=tz)
+
+    monkeypatch.setattr(build_summary, 'datetime', _Tomorrow)
+    build_summary.build_summary('us')
+    assert calls == ['data_quality']
+
+
+def test_manifest_version_change_rebuilds_every_section(tree, calls, monkeypatch):
+    """A new MANIFEST_VERSION (builder code/parameters changed) invalidates all sections."""
+    build_summary.build_summary('us')
+    calls.clear()
+    monkeypatch.setattr(build_summary, 'MANIFEST_VERSION', build_summary.MANIFEST_VERSION + 1)
+    build_summary.build_summary('us')
+    assert calls == list(build_summary.SECTIONS)
+
+
+def test_force_rebuilds_and_bypasses_parquet_cache(tree, calls):
+    """--force runs every builder and re-parses CSVs even if a sidecar claims to be fresh."""
+    build_summary.build_summary('us')
+    calls.clear()
+    csv_path = os.path.join(tree, 'out', 'us', 'macro_impact.csv')
+    poisoned = pd.read_csv(csv_path).assign(t_stat=[100.0, -100.0])
+    utils_io._write_parquet(poisoned, csv_path + '.parquet',
+                            source_key=utils_io._csv_key(csv_path))
+    summary = build_summary.build_summary('us', force=True)
+    assert calls == list(build_summary.SECTIONS)
+    assert [r['t_stat'] for r in summary['significant_impacts']] == [-4.0, 3.0]
+
+
+# ---------------------------------------------------------------------------
+# Section builders
+# ---------------------------------------------------------------------------
+
+def test_significant_impacts_optional_columns_missing(tree):
+    """macro_impact.csv without beta/p_adj_bh yields None values instead of failing."""
+    _write_csv(tree, 'out', 'macro_impact.csv', pd.DataFrame({
+        'event_type': ['CPI'], 'sector': ['XLK'], 'metric': ['t0_return_avg'], 'n': [30],
+        't_stat': [2.5], 'significant_bh': [False]}))
+    assert build_summary.build_significant_impacts('us') == [{
+        'event': 'CPI', 'sector': 'XLK', 'metric': 't0_return_avg', 'beta': None,
+        't_stat': 2.5, 'p_adj': None, 'significant': False, 'n': 30}]
+
+
+def test_write_json_non_str_keys(tmp_path):
+    """Keys orjson rejects (e.g. a NaN sector) fall back to json.dump coercion."""
+    path = str(tmp_path / 'summary.json')
+    build_summary._write_json(path, {'sectors': {float('nan'): 1, 'XLK': 2}})
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'sectors': {'NaN': 1, 'XLK': 2}}
+
+
+# ---------------------------------------------------------------------------
+# _scan_events_file
+# ---------------------------------------------------------------------------
+
+def test_scan_events_matches_across_chunk_boundaries(tree):
+    """Counters and the running top-N must not depend on how the file is chunked."""
+    path = os.path.join(tree, 'data', 'us', 'macro_events.csv')
+    whole = build_summary._scan_events_file(path, 0, 0, '2024-02-01', chunksize=1000)
+    split = build_summary._scan_events_file(path, 0, 0, '2024-02-01', chunksize=3)
+
+    assert split['quality'] == whole['quality']
+    assert split['quality']['total_events'] == 12
+    assert split['quality']['actual_fill_rate'] == round(8 / 12, 3)
+    assert split['quality']['event_types_no_data'] == ['GDP']
+    assert split['quality']['date_range'] == '2024-01-01 ~ 2024-01-24'
+
+    pd.testing.assert_frame_equal(split['recent'].reset_index(drop=True),
+                                  whole['recent'].reset_index(drop=True))
+    # Filled events only, newest first; top-N spans every chunk
+    assert split['recent']['actual_value'].tolist() == [10.0, 9.0, 7.0, 6.0, 4.0, 3.0, 1.0, 0.0]
+
+
+def test_scan_events_top_n_truncates_across_chunks(tree):
+    """With N smaller than a chunk, later chunks must still displace older events."""
+    path = os.path.join(tree, 'data', 'us', 'macro_events.csv')
+    scan = build_summary._scan_events_file(path, 1, 1, '2024-02-01', n=3, chunksize=2)
+    assert scan['recent']['actual_value'].tolist() == [10.0, 9.0, 7.0]
+
+
+def test_recent_events_n_above_default(tree):
+    """build_recent_events(n) returns n rows even when n > RECENT_EVENTS_N."""
+    events = pd.concat([_EVENTS] * 3, ignore_index=True)
+    _write_csv(tree, 'data', 'macro_events.csv', events)
+    assert len(build_summary.build_recent_events('us')) == build_summary.RECENT_EVENTS_N
+    assert len(build_summary.build_recent_events('us', n=15)) == 15
+    assert len(build_summary.build_recent_events('us', n=3)) == 3
+
+
+def test_scan_events_missing_file_returns_empty(tmp_path, monkeypatch):
+    """No macro_events.csv: both dependent sections degrade to empty values."""
+    monkeypatch.setattr(build_summary, 'BASE', str(tmp_path))
+    assert build_summary.build_data_quality('us') == {}
+    assert build_summary.build_recent_events('us') == []
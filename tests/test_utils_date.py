@@ -68,6 +68,19 @@ def test_to_date_end_of_year():
     assert result == date(2023, 12, 31)
 
 
+def test_to_date_repeated_calls_are_consistent():
+    """Memoisation must not change results for repeated good or bad strings."""
+    for _ in range(3):
+        assert to_date('2024-03-01') == date(2024, 3, 1)
+        assert to_date('2024-13-01') is None
+
+
+def test_to_date_unhashable_input_returns_none():
+    """Unhashable input (list/dict) cannot be memoised but must still return None."""
+    assert to_date(['2024-03-01']) is None
+    assert to_date({'d': '2024-03-01'}) is None
+
+
 # ---------------------------------------------------------------------------
 # to_datetime_col
 # ---------------------------------------------------------------------------
@@ -91,6 +104,15 @@ def test_to_datetime_col_invalid_entries_become_nat():
     assert result.iloc[0] == pd.Timestamp('2024-01-01')
 
 
+def test_to_datetime_col_non_strict_formats_fall_back_to_inference():
+    """Timestamps and slash dates the strict format rejects must still parse."""
+    s = pd.Series(['2024-01-15', '2024-01-16 00:00:00', '2024/01/17', 'bad-date'])
+    result = to_datetime_col(s)
+    assert result.iloc[:3].tolist() == [pd.Timestamp('2024-01-15'), pd.Timestamp('2024-01-16'),
+                                         pd.Timestamp('2024-01-17')]
+    assert pd.isna(result.iloc[3])
+
+
 def test_to_datetime_col_returns_series():
     """Return type must be a pandas Series."""
     s = pd.Series(['2024-01-01'])
@@ -0,0 +1,215 @@
+"""Unit tests for scripts/utils_io.py — read_df, write_df, read_csv_cached, invalidate_csv_cache."""
+import sys
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+# ---------------------------------------------------------------------------
+# Path setup
+# ---------------------------------------------------------------------------
+_SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, os.path.abspath(_SCRIPTS_DIR))
+
+import utils_io  # noqa: E402
+from utils_io import read_df, write_df, read_csv_cached, invalidate_csv_cache  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# read_df
+# ---------------------------------------------------------------------------
+
+def test_read_df_csv_roundtrip(tmp_path):
+    """Plain CSV is read with string/float dtypes intact."""
+    stem = str(tmp_path / 'events')
+    with open(stem + '.csv', 'w', encoding='utf-8') as f:
+        f.write('event_date,event_type,actual_value\n2024-01-15,CPI,3.1\n2024-02-15,CPI,\n')
+    df = read_df(stem, fmt='csv')
+    assert list(df.columns) == ['event_date', 'event_type', 'actual_value']
+    assert df['event_date'].tolist() == ['2024-01-15', '2024-02-15']
+    assert df['actual_value'].iloc[0] == pytest.approx(3.1)
+    assert pd.isna(df['actual_value'].iloc[1])
+
+
+def test_read_df_strips_bom(tmp_path):
+    """UTF-8 BOM must not leak into the first column name."""
+    stem = str(tmp_path / 'bom')
+    with open(stem + '.csv', 'w', encoding='utf-8-sig') as f:
+        f.write('a,b\n1,2\n')
+    df = read_df(stem, fmt='csv')
+    assert list(df.columns) == ['a', 'b']
+
+
+def test_read_df_skips_bad_lines(tmp_path):
+    """Rows with too many fields are skipped, not fatal."""
+    stem = str(tmp_path / 'bad')
+    with open(stem + '.csv', 'w', encoding='utf-8') as f:
+        f.write('a,b\n1,x\n2,y,z\n3,w\n')
+    df = read_df(stem, fmt='csv')
+    assert df['a'].tolist() == [1, 3]
+
+
+def test_read_df_python_engine_kwarg_still_honoured(tmp_path):
+    """Callers can still force the python engine (e.g. for regex separators)."""
+    stem = str(tmp_path / 'sep')
+    with open(stem + '.csv', 'w', encoding='utf-8') as f:
+        f.write('a;b\n1;2\n')
+    df = read_df(stem, fmt='csv', sep=r';+', engine='python')
+    assert df.to_dict('records') == [{'a': 1, 'b': 2}]
+
+
+def test_read_df_pyarrow_engine_opt_in(tmp_path, monkeypatch):
+    """With USE_PYARROW_CSV the pyarrow reader is tried first and still skips bad lines."""
+    monkeypatch.setattr(utils_io, '_CSV_ENGINES', ('pyarrow', 'c', 'python'))
+    stem = str(tmp_path / 'bad')
+    with open(stem + '.csv', 'w', encoding='utf-8-sig') as f:
+        f.write('a,b\n1,x\n2,y,z\n3,w\n')
+    df = read_df(stem, fmt='csv')
+    assert df['a'].tolist() == [1, 3]
+    assert df['b'].tolist() == ['x', 'w']
+
+
+def test_read_df_missing_file_returns_empty(tmp_path):
+    """Missing file must return an empty DataFrame, not raise."""
+    df = read_df(str(tmp_path / 'nope'))
+    assert df.empty
+
+
+# ---------------------------------------------------------------------------
+# write_df
+# ---------------------------------------------------------------------------
+
+def _frame():
+    return pd.DataFrame({'sector': ['XLK', 'XLF'], 't0_return_avg': [0.01, -0.02]})
+
+
+def test_write_df_auto_writes_parquet_and_csv(tmp_path):
+    """Default mode writes both files and read_df prefers the Parquet copy."""
+    stem = str(tmp_path / 'out')
+    write_df(_frame(), stem)
+    assert os.path.exists(stem + '.csv')
+    assert os.path.exists(stem + '.parquet')
+    pd.testing.assert_frame_equal(read_df(stem), _frame())
+
+
+def test_write_df_parquet_keeps_csv_by_default(tmp_path):
+    """fmt='parquet' still writes the CSV copy existing consumers rely on."""
+    stem = str(tmp_path / 'out')
+    write_df(_frame(), stem, fmt='parquet')
+    assert os.path.exists(stem + '.parquet')
+    assert os.path.exists(stem + '.csv')
+
+
+def test_write_df_parquet_only(tmp_path):
+    """fmt='parquet' with also_csv=False skips the CSV sidecar."""
+    stem = str(tmp_path / 'out')
+    write_df(_frame(), stem, fmt='parquet', also_csv=False)
+    assert os.path.exists(stem + '.parquet')
+    assert not os.path.exists(stem + '.csv')
+
+
+def test_write_df_csv_only_kwargs_not_sent_to_parquet(tmp_path, caplog):
+    """float_format formats the CSV and must not make the Parquet write fail."""
+    stem = str(tmp_path / 'out')
+    write_df(_frame(), stem, float_format='%.1f')
+    assert 'Parquet write failed' not in caplog.text
+    pd.testing.assert_frame_equal(pd.read_parquet(stem + '.parquet'), _frame())
+    assert pd.read_csv(stem + '.csv')['t0_return_avg'].tolist() == [0.0, -0.0]
+
+
+def test_write_df_csv_removes_stale_parquet(tmp_path):
+    """A CSV-only write must not leave an older Parquet file shadowing it."""
+    stem = str(tmp_path / 'out')
+    write_df(_frame(), stem)
+    newer = _frame().assign(t0_return_avg=[0.5, 0.6])
+    write_df(newer, stem, fmt='csv')
+    assert not os.path.exists(stem + '.parquet')
+    pd.testing.assert_frame_equal(read_df(stem), newer)
+
+
+# ---------------------------------------------------------------------------
+# read_csv_cached
+# ---------------------------------------------------------------------------
+
+def test_read_csv_cached_creates_and_reuses_sidecar(tmp_path):
+    """First read writes <csv>.parquet; second read is served from it."""
+    csv_path = str(tmp_path / 'impact.csv')
+    sidecar = str(tmp_path / 'impact.csv.parquet')
+    _frame().to_csv(csv_path, index=False)
+    first = read_csv_cached(csv_path)
+    assert os.path.exists(sidecar)
+    # Make the sidecar distinguishable (same source key) so we know it was used
+    utils_io._write_parquet(_frame().assign(sector=['CACHED', 'CACHED']), sidecar,
+                            source_key=utils_io._csv_key(csv_path))
+    second = read_csv_cached(csv_path)
+    pd.testing.assert_frame_equal(first, _frame())
+    assert second['sector'].tolist() == ['CACHED', 'CACHED']
+
+
+def test_read_csv_cached_invalidates_on_newer_csv(tmp_path):
+    """A CSV modified after the sidecar was written must be re-parsed."""
+    csv_path = str(tmp_path / 'impact.csv')
+    sidecar = str(tmp_path / 'impact.csv.parquet')
+    _frame().to_csv(csv_path, index=False)
+    read_csv_cached(csv_path)
+    newer = _frame().assign(t0_return_avg=[1.0, 2.0])
+    newer.to_csv(csv_path, index=False)
+    sidecar_mtime = os.path.getmtime(sidecar)
+    os.utime(csv_path, (sidecar_mtime + 10, sidecar_mtime + 10))
+    pd.testing.assert_frame_equal(read_csv_cached(csv_path), newer)
+
+
+def test_read_csv_cached_invalidates_on_restored_older_csv(tmp_path):
+    """Restoring a backup with its original mtime (copy2 / cp -p) must not serve the old cache."""
+    csv_path = str(tmp_path / 'impact.csv')
+    backup = str(tmp_path / 'backup.csv')
+    _frame().to_csv(csv_path, index=False)
+    shutil.copy2(csv_path, backup)
+    read_csv_cached(csv_path)
+    _frame().assign(t0_return_avg=[99.0, 99.0]).to_csv(csv_path, index=False)
+    read_csv_cached(csv_path)
+    shutil.copy2(backup, csv_path)
+    pd.testing.assert_frame_equal(read_csv_cached(csv_path), _frame())
+
+
+def test_read_csv_cached_leaves_no_temp_files(tmp_path):
+    """The sidecar is written through a unique temp file that is renamed into place."""
+    csv_path = str(tmp_path / 'impact.csv')
+    _frame().to_csv(csv_path, index=False)
+    read_csv_cached(csv_path)
+    assert sorted(os.listdir(tmp_path)) == ['impact.csv', 'impact.csv.parquet']
+
+
+def test_read_csv_cached_matches_read_csv_for_write_df_output(tmp_path):
+    """write_df's Parquet copy is not the cache: cached reads equal a real CSV parse."""
+    stem = str(tmp_path / 'impact')
+    df = _frame().assign(date=pd.to_datetime(['2024-01-15', '2024-02-15'])).set_index('sector')
+    write_df(df, stem, index=True)
+    expected = pd.read_csv(stem + '.csv')
+    pd.testing.assert_frame_equal(read_csv_cached(stem + '.csv'), expected)
+    pd.testing.assert_frame_equal(read_csv_cached(stem + '.csv'), expected)  # served from the sidecar
+
+
+def test_invalidate_csv_cache(tmp_path):
+    """Only stamped caches are removed."""
+    csv_path = str(tmp_path / 'impact.csv')
+    sidecar = str(tmp_path / 'impact.csv.parquet')
+    _frame().to_csv(csv_path, index=False)
+    read_csv_cached(csv_path)
+    invalidate_csv_cache(csv_path)
+    assert not os.path.exists(sidecar)
+    _frame().to_parquet(sidecar, index=False)
+    invalidate_csv_cache(csv_path)
+    assert os.path.exists(sidecar)
+
+
+def test_read_csv_cached_kwargs_bypass_cache(tmp_path):
+    """Parse-changing kwargs are honoured and never served from the sidecar."""
+    csv_path = str(tmp_path / 'impact.csv')
+    sidecar = str(tmp_path / 'impact.csv.parquet')
+    _frame().to_csv(csv_path, index=False)
+    df = read_csv_cached(csv_path, usecols=['sector'])
+    assert list(df.columns) == ['sector']
+    assert not os.path.exists(sidecar)